@@ -2,11 +2,15 @@
 
 """This module contains methods and classes for reading IOC files."""
 
+import hashlib
 import json
 import os
 import os.path
-import openpyxl.reader.excel as xlxs
-import re
+import pickle
+import sys
+import tempfile
+import xml.etree.ElementTree as ElementTree
+import zipfile
 
 # Constants: top taxa names in IOC
 TOP_TAXA_NAMES = ["NEOAVES", "NEOGNATHAE", "PALEOGNATHAE"]
@@ -15,6 +19,199 @@ TOP_TAXA_NAMES = ["NEOAVES", "NEOGNATHAE", "PALEOGNATHAE"]
 DEFAULT_DATA_DIR = "./gendata"
 DEFAULT_IOC_TAXONOMY_DIR = "ioc"
 VERSION_FILE_NAME = "version.json"
+INDEX_FILE_NAME = "index.json"
+BUNDLE_FILE_NAME = "taxonomy.jsonl"
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/coral")
+
+# Text preceding the IOC version in the header of the IOC files, e.g. "IOC WORLD BIRD LIST (14.1)"
+# in IOC Master files and "... IOC World Bird List (v 8.1)" in IOC Other Lists files.
+MASTER_VERSION_PREFIX = "IOC WORLD BIRD LIST ("
+OTHER_LISTS_VERSION_PREFIX = "(v "
+
+# Columns in IOC Other Lists files with the name, group and family of a taxon in each of the other
+# lists. Only some of the lists have a group column.
+OTHER_LISTS_COLUMNS = {'clements_2016': (5, 4, 18),
+                       'hbwbl_2016': (7, 6, 19),
+                       'hm4_4ed': (9, 8, 20),
+                       'hbw_2013': (10, None, 21),
+                       'peters_1986': (11, None, 22),
+                       'boyd': (12, None, 23),
+                       'hbwbl_2017': (13, None, 24),
+                       'sibley_1993': (14, None, 25),
+                       'ioc_7_2': (15, None, 26),
+                       'ioc_7_1': (16, None, 27)}
+
+# Fields of taxa with values that are shared by many taxa, e.g. authorities like "Linnaeus, 1758"
+# and breeding ranges like "AF". These are interned when taxa are loaded from JSON files, so that
+# each distinct value is stored once.
+INTERNED_TAXON_FIELDS = ('rank', 'supertaxon', 'authority', 'breeding_range', 'nonbreeding_range',
+                         'code')
+
+# The key of the name that taxa of each rank are indexed by in IocWbl.index, and the key of the
+# count of taxa of the rank in IocWbl.stats.
+RANK_INDEX_KEYS = {'Infraclass': ('name', 'infraclass_count'),
+                   'Order': ('name', 'order_count'),
+                   'Family': ('name', 'family_count'),
+                   'Genus': ('name', 'genus_count'),
+                   'Species': ('binomial_name', 'species_count'),
+                   'Subspecies': ('trinomial_name', 'subspecies_count')}
+
+# Languages of the common names in IOC Multilingual files, in the order they are read from the
+# file. Versions 7.3 and 8.1 use ISO 639-2 codes, with the names of a species spread over three
+# rows. Version 14.1 and later use IETF BCP 47 language codes, with one species per row. There is
+# a Python module 'langcodes' that can be used to work with them. E.g:
+# `langcodes.get("zh-Hant").display_name()` will return 'Chinese (Traditional)'.
+MULTILINGUAL_LANGUAGES_8_1 = ('cat', 'cze', 'est', 'ger', 'ind', 'lav', 'pol', 'slo', 'swe',
+                              'eng', 'chi', 'dan', 'fin', 'hun', 'ita', 'lit', 'por', 'slv',
+                              'lzh', 'dut', 'fre', 'ice', 'jpn', 'nno', 'rus', 'spa')
+MULTILINGUAL_LANGUAGES_14_1 = ('en', 'ca', 'zh-Hans', 'zh-Hant', 'hr', 'cs', 'da', 'nl', 'fi', 'fr',
+                               'de', 'it', 'ja', 'lt', 'no', 'pl', 'pt-br', 'pt', 'ru', 'sr', 'sk',
+                               'es', 'sv', 'tr', 'uk', 'af', 'ar', 'be', 'bg', 'et', 'el', 'he',
+                               'hu', 'is', 'id', 'ko', 'lv', 'mk', 'ml', 'se', 'fa', 'ro', 'sl',
+                               'th')
+
+# XML namespaces used in the parts of an Excel file (.xlsx) that are parsed by 'worksheet_rows'.
+SPREADSHEETML = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELATIONSHIPS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_RELATIONSHIPS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _column_index(cell_reference):
+    """Returns the 0-based column index of `cell_reference`, e.g. 0 for 'A5' and 27 for 'AB5'."""
+    index = 0
+    for c in cell_reference:
+        if c.isdigit():
+            break
+        index = index * 26 + ord(c) - 64
+    return index - 1
+
+
+def _text(element):
+    """Returns the text of the shared or inline string `element`, which may be split in several
+       runs of rich text."""
+    return "".join(t.text or "" for t in element.iter(SPREADSHEETML + "t"))
+
+
+def _first_worksheet_path(archive):
+    """Returns the path of the XML-file of the first worksheet in the opened Excel file
+       `archive`."""
+    workbook = ElementTree.parse(archive.open("xl/workbook.xml")).getroot()
+    sheet_id = workbook.find(f"{SPREADSHEETML}sheets/{SPREADSHEETML}sheet").get(
+        RELATIONSHIPS + "id")
+    relationships = ElementTree.parse(archive.open("xl/_rels/workbook.xml.rels")).getroot()
+    for relationship in relationships.iter(PACKAGE_RELATIONSHIPS + "Relationship"):
+        if relationship.get("Id") == sheet_id:
+            target = relationship.get("Target")
+            return target.lstrip("/") if target.startswith("/") else "xl/" + target
+    raise ValueError(f"No worksheet found for the first sheet in '{archive.filename}'.")
+
+
+def _shared_strings(archive, count=None):
+    """Returns the list of shared strings in the opened Excel file `archive`, which the cells
+       refer to by index. If `count` is given, only the first `count` strings are read."""
+    strings = []
+    if count != 0 and "xl/sharedStrings.xml" in archive.namelist():
+        for event, element in ElementTree.iterparse(archive.open("xl/sharedStrings.xml")):
+            if element.tag == SPREADSHEETML + "si":
+                strings.append(_text(element))
+                element.clear()
+                if len(strings) == count:
+                    break
+    return strings
+
+
+def _row_values(element, width, strings):
+    """Returns the values of the cells of the worksheet row `element` as a list, padded with None
+       to `width` values. `strings` are the shared strings of the Excel file."""
+    row = [None] * width
+    column = -1
+    for cell in element:
+        # The cell reference is optional. Without it, a cell follows the previous cell.
+        r = cell.get("r")
+        column = _column_index(r) if r else column + 1
+        value = cell.find(SPREADSHEETML + "v")
+        cell_type = cell.get("t")
+        if cell_type == "inlineStr":
+            value = _text(cell)
+        elif value is None:
+            continue
+        elif cell_type == "s":
+            value = strings[int(value.text)]
+        elif cell_type == "b":
+            value = value.text == "1"
+        elif cell_type in ("str", "e", "d"):
+            value = value.text
+        elif "." in value.text or "E" in value.text or "e" in value.text:
+            value = float(value.text)
+        else:
+            value = int(value.text)
+        if column >= len(row):
+            row.extend([None] * (column + 1 - len(row)))
+        row[column] = value
+    return row
+
+
+def inspect_workbook(filepath, min_width=0):
+    """Returns the titles of the worksheets in the Excel file `filepath`, in order, and the
+       header (first) row of the first worksheet as a tuple of cell values, like the first row
+       from `worksheet_rows` with the same `min_width`. Only the start of the worksheet and the
+       shared strings used in the header row are read, and the file is closed again. Prints an
+       error message and re-raises the exception if it is not an Excel file."""
+    try:
+        with zipfile.ZipFile(filepath) as archive:
+            workbook = ElementTree.parse(archive.open("xl/workbook.xml")).getroot()
+            titles = [sheet.get("name") for sheet in workbook.iter(SPREADSHEETML + "sheet")]
+            width = min_width
+            element = None
+            for event, element in ElementTree.iterparse(
+                    archive.open(_first_worksheet_path(archive))):
+                if element.tag == SPREADSHEETML + "dimension":
+                    width = max(_column_index(element.get("ref").split(":")[-1]) + 1, min_width)
+                elif element.tag == SPREADSHEETML + "row":
+                    break
+            if element is None or element.tag != SPREADSHEETML + "row" or \
+               element.get("r", "1") != "1":
+                return titles, (None,) * width
+            # Read the shared strings up to the last one used in the header row. Excel writes the
+            # shared strings in the order they are first used, so these are few.
+            indices = [int(cell.find(SPREADSHEETML + "v").text) for cell in element
+                       if cell.get("t") == "s" and cell.find(SPREADSHEETML + "v") is not None]
+            strings = _shared_strings(archive, max(indices) + 1 if indices else 0)
+            return titles, tuple(_row_values(element, width, strings))
+    except (zipfile.BadZipFile, KeyError):
+        print(f"Error: {filepath} is not an Excel file (.xlxs).")
+        raise
+
+
+def worksheet_rows(filepath, min_row=1, min_width=0):
+    """Yields the rows of the first worksheet in the Excel file `filepath`, starting with row
+       `min_row`, as tuples of cell values. All rows have at least `min_width` values, also if the
+       worksheet has no dimension (the range of its cells), which is optional. Otherwise it gives
+       the same rows as openpyxl's `iter_rows(min_row=min_row, values_only=True)` on a read-only
+       workbook, except that dates are not converted (date cells give the serial number, or the
+       ISO text for 'd' cells), but it parses the worksheet XML directly which is about twice as
+       fast. It is used to read all the IOC files."""
+    with zipfile.ZipFile(filepath) as archive:
+        sheet_path = _first_worksheet_path(archive)
+        strings = _shared_strings(archive)
+        # Read the rows. Like openpyxl, we pad all rows to the width of the worksheet and yield
+        # empty rows for rows that are missing in the file.
+        width = min_width
+        previous_row_number = 0
+        for event, element in ElementTree.iterparse(archive.open(sheet_path)):
+            if element.tag == SPREADSHEETML + "dimension":
+                width = max(_column_index(element.get("ref").split(":")[-1]) + 1, min_width)
+            elif element.tag == SPREADSHEETML + "row":
+                # The row reference is optional. Without it, a row follows the previous row.
+                r = element.get("r")
+                row_number = int(r) if r else previous_row_number + 1
+                row = _row_values(element, width, strings)
+                element.clear()
+                for empty_row_number in range(max(previous_row_number + 1, min_row), row_number):
+                    yield (None,) * width
+                previous_row_number = row_number
+                if row_number >= min_row:
+                    yield tuple(row)
 
 
 class InvalidIocMasterFile (Exception):
@@ -74,84 +271,164 @@ class IocWbl(object):
                 print(f"Error: IOC World Bird List directory {dirpath} not found.")
                 raise IocWblDirectoryNotFound(dirpath)
 
-    def _write_taxon_to_file(self, directory, taxon):
-        """Write the JSON representation of 'taxon' to file."""
-        for subtaxon in taxon['subtaxa']:
-            self._write_taxon_to_file(directory, subtaxon)
+    def _taxon_file_name(self, taxon):
+        """Returns the name of the file with the JSON representation of 'taxon'."""
         if taxon['rank'] == "Species":
-            fname = taxon['binomial_name'].replace(" ", "_") + ".json"
+            return taxon['binomial_name'].replace(" ", "_") + ".json"
         elif taxon['rank'] == "Subspecies":
-            fname = taxon['trinomial_name'].replace(" ", "_") + ".json"
+            return taxon['trinomial_name'].replace(" ", "_") + ".json"
         else:
-            fname = taxon['name'] + ".json"
+            return taxon['name'] + ".json"
+
+    def _write_taxon_to_file(self, directory, taxon, fname):
+        """Write the JSON representation of 'taxon' to the file 'fname'. The subtaxa are written
+           to their own files first, and are referred to by their file names in the written
+           taxon. 'taxon' itself is not changed, so the taxonomy can still be used after it has
+           been written."""
         subtaxa_files = []
         for subtaxon in taxon['subtaxa']:
-            if subtaxon['rank'] == "Species":
-                subtaxa_files.append(subtaxon['binomial_name'].replace(" ", "_") + ".json")
-            elif subtaxon['rank'] == "Subspecies":
-                subtaxa_files.append(subtaxon['trinomial_name'].replace(" ", "_") + ".json")
-            else:
-                subtaxa_files.append(subtaxon['name'] + ".json")
-        taxon['subtaxa'] = subtaxa_files
-        f = open(os.path.join(directory, fname), 'w')
-        f.write(json.dumps(taxon))
-        f.close()
+            subtaxon_fname = self._taxon_file_name(subtaxon)
+            self._write_taxon_to_file(directory, subtaxon, subtaxon_fname)
+            subtaxa_files.append(subtaxon_fname)
+        # A shallow copy keeps the order of the keys, so the JSON is the same as before.
+        payload = taxon.copy()
+        payload['subtaxa'] = subtaxa_files
+        # The whole taxon is encoded with one json.dumps() call, which uses the C encoder, and
+        # then written at once. json.dump() encodes in many small chunks and is several times
+        # slower for these small objects. The JSON is ASCII, so we write the bytes with os.write()
+        # and skip the buffered text file object, which costs about as much as the write itself
+        # for these small files. os.write() may write only part of the bytes, so we write until
+        # all have been written. It raises OSError if nothing could be written, e.g. if the disk
+        # is full.
+        data = memoryview(json.dumps(payload).encode('ascii'))
+        fd = os.open(os.path.join(directory, fname), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+    def _write_taxon_to_bundle(self, bundle, taxon):
+        """Write the JSON representation of 'taxon' as a line to the open JSON Lines file
+           'bundle'. The subtaxa are written first, and are referred to by the names of the files
+           they are written to when they are not bundled, like in `_write_taxon_to_file`."""
+        subtaxa_files = []
+        for subtaxon in taxon['subtaxa']:
+            self._write_taxon_to_bundle(bundle, subtaxon)
+            subtaxa_files.append(self._taxon_file_name(subtaxon))
+        payload = taxon.copy()
+        payload['subtaxa'] = subtaxa_files
+        bundle.write(json.dumps(payload) + "\n")
 
-    def write_to_files(self, dirpath, version_file_name=VERSION_FILE_NAME):
+    def write_to_files(self, dirpath, version_file_name=VERSION_FILE_NAME, bundle=False):
         """Write JSON representations of the taxa in IOC taxonomy to files in the directory
-           `dirpath`."""
+           `dirpath`. If `bundle` is True, all taxa are written to the single JSON Lines file
+           BUNDLE_FILE_NAME, one taxon per line, instead of one file per taxon."""
         assert os.path.exists(dirpath)
-        f = open(os.path.join(dirpath, version_file_name), 'w')
-        v = {"version": self.version}
-        f.write(json.dumps(v))
-        f.close()
+        with open(os.path.join(dirpath, version_file_name), 'w') as f:
+            v = {"version": self.version}
+            f.write(json.dumps(v))
+        if bundle:
+            with open(os.path.join(dirpath, BUNDLE_FILE_NAME), 'w') as f:
+                for taxon in self.taxonomy:
+                    self._write_taxon_to_bundle(f, taxon)
+            return
+        # Write an index with the files of the infraclasses, so that they can be found without
+        # searching all files when the taxonomy is loaded.
+        with open(os.path.join(dirpath, INDEX_FILE_NAME), 'w') as f:
+            index = {"infraclasses": [self._taxon_file_name(taxon) for taxon in self.taxonomy]}
+            f.write(json.dumps(index))
         for taxon in self.taxonomy:
-            self._write_taxon_to_file(dirpath, taxon)
+            self._write_taxon_to_file(dirpath, taxon, self._taxon_file_name(taxon))
+
+    def _intern_fields(self, taxon):
+        """Intern the string values of the fields in INTERNED_TAXON_FIELDS of `taxon`. The JSON
+           decoder creates a new string object for every value it reads."""
+        for field in INTERNED_TAXON_FIELDS:
+            value = taxon.get(field)
+            if value is not None:
+                taxon[field] = sys.intern(value)
 
-    def _load_subtaxa(self, taxon, dirpath):
+    def _scan_taxa(self, dirpath, version_file_name):
+        """Returns a dict with the taxa in all JSON-files in the directory `dirpath`, indexed by
+           their file names. This is used to find the infraclasses in directories written before
+           there was an index file."""
+        taxa = {}
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.name != version_file_name:
+                    f = open(entry.path)
+                    taxon = json.load(f)
+                    f.close()
+                    self._intern_fields(taxon)
+                    taxa[entry.name] = taxon
+        return taxa
+
+    def _read_bundle(self, path):
+        """Returns a dict with the taxa in the JSON Lines file `path` written by `write_to_files`,
+           indexed by the names of the files they are written to when they are not bundled."""
+        taxa = {}
+        with open(path) as f:
+            for line in f:
+                taxon = json.loads(line)
+                self._intern_fields(taxon)
+                taxa[self._taxon_file_name(taxon)] = taxon
+        return taxa
+
+    def _load_taxon(self, dirpath, fname, scanned_taxa):
+        """Returns the taxon in the file `fname` in the directory `dirpath`. If the file has
+           already been read by `_scan_taxa`, the taxon is taken from `scanned_taxa` instead."""
+        if fname in scanned_taxa:
+            return scanned_taxa.pop(fname)
+        f = open(os.path.join(dirpath, fname))
+        taxon = json.load(f)
+        f.close()
+        self._intern_fields(taxon)
+        return taxon
+
+    def _load_subtaxa(self, taxon, dirpath, scanned_taxa):
         """Load the subtaxa for the given taxon."""
         i = 0
         for name in taxon['subtaxa']:
-            f = open(os.path.join(dirpath, name))
-            t = json.load(f)
-            f.close()
+            t = self._load_taxon(dirpath, name, scanned_taxa)
             taxon['subtaxa'][i] = t
-            if t['rank'] == "Order":
-                self.index[t['name']] = t
-                self.stats['order_count'] += 1
-            elif t['rank'] == "Family":
-                self.index[t['name']] = t
-                self.stats['family_count'] += 1
-            elif t['rank'] == "Genus":
-                self.index[t['name']] = t
-                self.stats['genus_count'] += 1
-            elif t['rank'] == "Species":
-                self.index[t['binomial_name']] = t
-                self.stats['species_count'] += 1
-            elif t['rank'] == "Subspecies":
-                self.index[t['trinomial_name']] = t
-                self.stats['subspecies_count'] += 1
-            self._load_subtaxa(t, dirpath)
+            if t['rank'] in RANK_INDEX_KEYS:
+                name_key, count_key = RANK_INDEX_KEYS[t['rank']]
+                self.index[t[name_key]] = t
+                self.stats[count_key] += 1
+            self._load_subtaxa(t, dirpath, scanned_taxa)
             i += 1
 
     def load_taxonomy(self, dirpath, version_file_name=VERSION_FILE_NAME):
         """Load IOC taxonomy from files in the directory `dirpath`."""
         # Read version
-        p = os.path.join(DEFAULT_DATA_DIR, DEFAULT_IOC_TAXONOMY_DIR)
-        f = open(os.path.join(p, VERSION_FILE_NAME))
+        f = open(os.path.join(dirpath, version_file_name))
         self.version = json.load(f)["version"]
         f.close()
-        # Read infraclasses:
-        p = os.popen("grep -l '\"rank\": \"Infraclass\"' %s/*.json" % (dirpath))
-        filenames = p.read().split()
-        p.close()
-        for fname in filenames:
-            f = open(fname)
-            taxon = json.load(f)
+        # Read infraclasses. Directories written before there was an index file are scanned for
+        # the files of the infraclasses. All taxa are read by the scan, so they are kept and used
+        # when the subtaxa are loaded, instead of reading the files again. The same is done with
+        # all taxa in a bundle file.
+        bundle_path = os.path.join(dirpath, BUNDLE_FILE_NAME)
+        index_path = os.path.join(dirpath, INDEX_FILE_NAME)
+        if os.path.isfile(bundle_path):
+            scanned_taxa = self._read_bundle(bundle_path)
+            filenames = [name for name, taxon in scanned_taxa.items()
+                         if taxon['rank'] == "Infraclass"]
+        elif os.path.isfile(index_path):
+            f = open(index_path)
+            filenames = json.load(f)["infraclasses"]
             f.close()
+            scanned_taxa = {}
+        else:
+            scanned_taxa = self._scan_taxa(dirpath, version_file_name)
+            filenames = sorted(name for name, taxon in scanned_taxa.items()
+                               if taxon.get('rank') == "Infraclass")
+        for fname in filenames:
+            taxon = self._load_taxon(dirpath, fname, scanned_taxa)
             self.index[taxon['name']] = taxon
             self.taxonomy.append(taxon)
-            self._load_subtaxa(taxon, dirpath)
+            self._load_subtaxa(taxon, dirpath, scanned_taxa)
             self.stats['infraclass_count'] += 1
 
 
@@ -159,175 +436,257 @@ class IocMasterFile (object):
     """Represents a IOC Master file (Excel). This is the first file that must be read. It will set
        up an IocWbl object that can then be passed to the other 3 IOC file clases."""
 
+    __slots__ = ('order', 'path', 'version', 'iocwbl', 'column_shift', 'taxonomy_stats')
+
     def __init__(self, filepath):
-        """Initialize with Excel file `filepath`. This will not read the contents of the file."""
-        # Check that it is an Excel-file.
-        try:
-            wb = xlxs.load_workbook(filepath)
-        except xlxs.InvalidFileException:
-            print(f"Error: {filepath} is not an Excel file (.xlxs).")
-            raise
-        # Check that it is a IOC Master file, and if so initialize it.
-        if self._is_master_wb(wb):
+        """Initialize with Excel file `filepath`. This will only read the worksheet titles and the
+           header row of the file."""
+        # Check that it is an Excel-file, and that it is a IOC Master file, and if so initialize
+        # it. The file is not opened with openpyxl, since loading the workbook takes longer than
+        # reading all its rows with `worksheet_rows`. The rest of the rows are read by `read`, so
+        # no file is kept open in between. The header is padded to the cells with the version.
+        titles, header = inspect_workbook(filepath, min_width=3)
+        if self._is_master_title(titles[0]):
             self.order = 1
-            self.workbook = wb
             self.path = filepath
-            self.version = self._master_wb_version(self.workbook)
+            self.version = self._master_version(header)
             self.iocwbl = IocWbl()
         else:
             print((f"Error: '{filepath}' is not a valid IOC Master File.\n"
                    f"An IOC Master file must have the title 'Master' in the first worksheet."))
-            raise InvalidIocMasterFile(self.path)
+            raise InvalidIocMasterFile(filepath)
         # Check the version, to see if we need to do column shift when reading data from it.
         if self.version in ["8.1", "7.3"]:
             self.column_shift = 0
         elif self.version >= "14.1":
             self.column_shift = 1
 
-    def _is_master_wb(self, wb):
-        """True if 'wb' is an IOC Masterfile Excel workbook, otherwise False."""
-        return wb.worksheets[0].title == "Master"
-
-    def _master_wb_version(self, wb):
-        """Returns the IOC version number of the workbook. Returns None if not able to establish
-           the version."""
-        if self._is_master_wb(wb):
-            if wb.worksheets[0].cell(row=1, column=2).value:
-                version_string = wb.worksheets[0].cell(row=1, column=2).value
-            elif wb.worksheets[0].cell(row=1, column=3).value:
-                version_string = wb.worksheets[0].cell(row=1, column=3).value
-            regexp = re.compile(r"IOC WORLD BIRD LIST \((.*)\)")
-            mo = regexp.search(version_string)
-            return mo[1]
-        else:
+    def _is_master_title(self, title):
+        """True if 'title' is the title of the first worksheet of an IOC Master file, otherwise
+           False."""
+        return title == "Master"
+
+    def _master_version(self, header):
+        """Returns the IOC version number in the `header` row of the workbook."""
+        # The version is in the second or the third cell of the header row.
+        version_string = header[1] or header[2]
+        start = version_string.index(MASTER_VERSION_PREFIX) + len(MASTER_VERSION_PREFIX)
+        return version_string[start:version_string.rindex(")")]
+
+    def _cache_path(self, cache_dir):
+        """Returns the path of the file in `cache_dir` with the cached taxonomy of the IOC Master
+           file. The name of the file is made of a hash of the path of the IOC Master file and a
+           hash of its modification time and size and of the modification time of this module, so
+           that a changed IOC Master file or a changed reader will not use an old cached taxonomy,
+           and so that the old cache files of the same IOC Master file can be found."""
+        path_key = hashlib.blake2b(os.path.abspath(self.path).encode(), digest_size=16)
+        version_key = hashlib.blake2b((f"{os.path.getmtime(self.path)}:"
+                                       f"{os.path.getsize(self.path)}:"
+                                       f"{os.path.getmtime(__file__)}").encode(), digest_size=16)
+        return os.path.join(cache_dir, f"{path_key.hexdigest()}-{version_key.hexdigest()}.pkl")
+
+    def _load_cache(self, cache_path):
+        """Returns the cached (taxonomy, index, stats) in the file `cache_path`. Returns None if
+           there is no such file or if it can't be read, e.g. because it has been damaged."""
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            taxonomy, index, stats = cached
+        except Exception:
+            # Unpickling damaged data can fail with almost any exception, and the file can hold
+            # something else than a 3-tuple.
+            return None
+        if not (isinstance(taxonomy, list) and isinstance(index, dict) and
+                isinstance(stats, dict) and stats.keys() == self.iocwbl.stats.keys()):
             return None
+        return taxonomy, index, stats
 
-    def read(self):
+    def _save_cache(self, cache_path):
+        """Save the taxonomy, index and stats of `self.iocwbl` to the file `cache_path`, and remove
+           the cache files of older versions of the same IOC Master file."""
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file that is then moved into place, so that an interrupted run
+        # can't leave a partially written cache file.
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((self.iocwbl.taxonomy, self.iocwbl.index, self.iocwbl.stats), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        path_prefix = os.path.basename(cache_path).split("-")[0] + "-"
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if (entry.name.startswith(path_prefix) and entry.name.endswith(".pkl") and
+                        entry.path != cache_path):
+                    os.remove(entry.path)
+
+    def _taxon(self, rank, name, authority, common_name, details):
+        """Returns a new taxon of `rank` with `name`, without the keys that depend on the rank.
+           `details` are the breeding range, breeding subranges, nonbreeding range, code and
+           comment of the taxon."""
+        breeding_range, breeding_subranges, nonbreeding_range, code, comment = details
+        # Taxa in 'other_classifications' are taxa in other lists which are equivalent to the
+        # taxon.
+        return {'other_classifications': [],
+                'authority': authority,
+                'common_names': {'en': common_name},
+                'breeding_range': breeding_range,
+                'breeding_subranges': breeding_subranges,
+                'nonbreeding_range': nonbreeding_range,
+                'code': code,
+                'comment': comment,
+                'subtaxa': [],
+                'rank': rank,
+                'name': name}
+
+    def read(self, cache_dir=None):
         """Read the taxonomy data into the attribute 'self.taxonomy' and
-           save statistics in the attribute 'self.taxonomy_stats'."""
+           save statistics in the attribute 'self.taxonomy_stats'. If `cache_dir` is given, the
+           taxonomy is loaded from a cache file in that directory if the IOC Master file has been
+           read before, and otherwise saved to a cache file there after it has been read."""
         self.taxonomy_stats = {'infraclass_count': 0,
                                'order_count': 0,
                                'family_count': 0,
                                'genus_count': 0,
                                'species_count': 0,
                                'subspecies_count': 0}
-        ws = self.workbook.worksheets[0]
-        for row in ws.iter_rows(min_row=5):
-            infraclass = row[0].value
-            order = row[1+self.column_shift].value
-            family = row[2+self.column_shift].value
-            family_en = row[3+self.column_shift].value
-            genus = row[4+self.column_shift].value
-            species = row[5+self.column_shift].value
-            subspecies = row[6+self.column_shift].value
-            taxon = {'other_classifications': [],  # Taxa in other lists which
-                                                   # are equivalent to this taxon
-                     'authority': row[7+self.column_shift].value,
-                     'common_names': {'en': row[8+self.column_shift].value},
-                     'breeding_range': row[9+self.column_shift].value,
-                     'breeding_subranges': row[10+self.column_shift].value,
-                     'nonbreeding_range': row[11+self.column_shift].value,
-                     'code': row[12+self.column_shift].value,
-                     'comment': row[13+self.column_shift].value,
-                     'subtaxa': []}
+        if cache_dir:
+            cache_path = self._cache_path(cache_dir)
+            cached = self._load_cache(cache_path)
+            if cached:
+                self.iocwbl.taxonomy, self.iocwbl.index, self.iocwbl.stats = cached
+                return
+        shift = self.column_shift
+        taxonomy = self.iocwbl.taxonomy
+        index = self.iocwbl.index
+        # Count the taxa of each rank in local variables, and add them to the statistics after
+        # reading all rows.
+        infraclass_count = order_count = family_count = genus_count = species_count = 0
+        subspecies_count = 0
+        # The most recently read taxon of each rank, i.e. the current parent of the following rows.
+        current_infraclass = current_order = current_family = current_genus = current_species = None
+        new_taxon = self._taxon
+        # The taxa start at row 5, after the header rows. The rows have at least the 13 columns
+        # that are unpacked below, after the (shifted) infraclass column.
+        for row in worksheet_rows(self.path, min_row=5, min_width=14 + shift):
+            infraclass = row[0]
+            (order, family, family_en, genus, species, subspecies, authority,
+             name_en) = row[1+shift:9+shift]
+            # The breeding range, breeding subranges, nonbreeding range, code and comment.
+            details = row[9+shift:14+shift]
             if infraclass:
-                taxon['rank'] = "Infraclass"
-                taxon['name'] = infraclass
-                self.iocwbl.taxonomy.append(taxon)
-                self.iocwbl.index[infraclass] = taxon
-                self.iocwbl.stats['infraclass_count'] += 1
+                taxon = new_taxon("Infraclass", infraclass, authority, name_en, details)
+                taxonomy.append(taxon)
+                index[infraclass] = taxon
+                infraclass_count += 1
+                current_infraclass = taxon
                 order_i = 1
             elif order:
-                taxon['rank'] = "Order"
-                taxon['name'] = order
-                taxon['supertaxon'] = self.iocwbl.taxonomy[-1]['name']
+                taxon = new_taxon("Order", order, authority, name_en, details)
+                taxon['supertaxon'] = current_infraclass['name']
                 taxon['sort_index'] = order_i
                 order_i += 1
-                self.iocwbl.taxonomy[-1]['subtaxa'].append(taxon)
-                self.iocwbl.index[order] = taxon
-                self.iocwbl.stats['order_count'] += 1
+                current_infraclass['subtaxa'].append(taxon)
+                index[order] = taxon
+                order_count += 1
+                current_order = taxon
                 family_i = 1
             elif family:
-                taxon['rank'] = "Family"
-                taxon['name'] = family
-                taxon['common_names'] = {'en': family_en}
-                taxon['supertaxon'] = self.iocwbl.taxonomy[-1]['subtaxa'][-1]['name']
+                taxon = new_taxon("Family", family, authority, family_en, details)
+                taxon['supertaxon'] = current_order['name']
                 taxon['sort_index'] = family_i
                 family_i += 1
-                self.iocwbl.taxonomy[-1]['subtaxa'][-1]['subtaxa'].append(taxon)
-                self.iocwbl.index[family] = taxon
-                self.iocwbl.stats['family_count'] += 1
+                current_order['subtaxa'].append(taxon)
+                index[family] = taxon
+                family_count += 1
+                current_family = taxon
                 genus_i = 1
             elif genus:
-                taxon['rank'] = "Genus"
                 # Strip trailing "extinct" characters '\u2020' and whitespace
-                taxon['name'] = genus.title().strip('\u2020').strip()
-                taxon['supertaxon'] = self.iocwbl.taxonomy[-1]['subtaxa'][-1]['subtaxa'][-1]['name']
+                genus_name = genus.title().strip('\u2020').strip()
+                taxon = new_taxon("Genus", genus_name, authority, name_en, details)
+                taxon['supertaxon'] = current_family['name']
                 taxon['sort_index'] = genus_i
                 genus_i += 1
-                self.iocwbl.taxonomy[-1]['subtaxa'][-1]['subtaxa'][-1]['subtaxa'].append(taxon)
-                self.iocwbl.index[genus] = taxon
-                self.iocwbl.stats['genus_count'] += 1
+                current_family['subtaxa'].append(taxon)
+                index[genus] = taxon
+                genus_count += 1
+                current_genus = taxon
                 species_i = 1
             elif species:
-                taxon['rank'] = "Species"
-                taxon['name'] = species
-                taxon['supertaxon'] = (self.iocwbl.taxonomy[-1]['subtaxa'][-1]['subtaxa'][-1]
-                                       ['subtaxa'][-1]['name'])
-                genus = taxon['supertaxon']
                 # Strip trailing "extinct" characters '\u2020' and whitespace
-                taxon['binomial_name'] = (genus + " " + species).strip('\u2020').strip()
+                binomial_name = (current_genus['name'] + " " + species).strip('\u2020').strip()
+                taxon = new_taxon("Species", species, authority, name_en, details)
+                taxon['supertaxon'] = current_genus['name']
+                taxon['binomial_name'] = binomial_name
                 taxon['sort_index'] = species_i
                 species_i += 1
-                subtaxa = (self.iocwbl.taxonomy[-1]['subtaxa'][-1]['subtaxa'][-1]['subtaxa'][-1]
-                           ['subtaxa'])
-                subtaxa.append(taxon)
-                self.iocwbl.index[taxon['binomial_name']] = taxon
-                self.iocwbl.stats['species_count'] += 1
+                current_genus['subtaxa'].append(taxon)
+                index[binomial_name] = taxon
+                species_count += 1
+                current_species = taxon
                 subspecies_i = 1
             elif subspecies:
-                taxon['rank'] = "Subspecies"
-                taxon['name'] = subspecies
-                taxon['supertaxon'] = (self.iocwbl.taxonomy[-1]['subtaxa'][-1]['subtaxa'][-1]
-                                       ['subtaxa'][-1]['subtaxa'][-1]['name'])
-                genus = (self.iocwbl.taxonomy[-1]['subtaxa'][-1]['subtaxa'][-1]['subtaxa'][-1]
-                         ['name'])
-                species = taxon['supertaxon']
-                taxon['sort_index'] = subspecies_i
-                subspecies_i += 1
                 # Strip trailing "extinct" characters '\u2020' and whitespace
-                s = genus + " " + species + " " + subspecies
+                s = current_genus['name'] + " " + current_species['name'] + " " + subspecies
                 trinomial_name = s.strip('\u2020').strip()
                 # Strip "extinct" characters '\u2020' in trinomial name
-                taxon['trinomial_name'] = trinomial_name.replace(" \u2020", "")
-                subtaxa = (self.iocwbl.taxonomy[-1]['subtaxa'][-1]['subtaxa'][-1]['subtaxa'][-1]
-                           ['subtaxa'][-1]['subtaxa'])
-                subtaxa.append(taxon)
-                self.iocwbl.index[taxon['trinomial_name']] = taxon
-                self.iocwbl.stats['subspecies_count'] += 1
+                trinomial_name = trinomial_name.replace(" \u2020", "")
+                taxon = new_taxon("Subspecies", subspecies, authority, name_en, details)
+                taxon['supertaxon'] = current_species['name']
+                taxon['sort_index'] = subspecies_i
+                taxon['trinomial_name'] = trinomial_name
+                subspecies_i += 1
+                current_species['subtaxa'].append(taxon)
+                index[trinomial_name] = taxon
+                subspecies_count += 1
+        stats = self.iocwbl.stats
+        stats['infraclass_count'] += infraclass_count
+        stats['order_count'] += order_count
+        stats['family_count'] += family_count
+        stats['genus_count'] += genus_count
+        stats['species_count'] += species_count
+        stats['subspecies_count'] += subspecies_count
+        if cache_dir:
+            self._save_cache(cache_path)
 
 
 class IocOtherListsFile (object):
     """Represents a IOC Other Lists file (Excel). NOTE: This file seems to have been dropped from
        the IOC files somewhere between version 8.1 and 14.1."""
 
+    __slots__ = ('order', 'path', 'version', 'iocwbl', 'lists', 'seq_nos', 'names',
+                 'ranks', 'notes', 'iucn_red_list_categories', 'list_columns', 'index',
+                 'following_rows', 'taxonomy_stats')
+
     def __init__(self, filepath, iocwbl):
         """Initialize with Excel file `filepath` and an `iocwbl` object obtained from an
-           `IocMasterFile` object. This will not read the contents of the file."""
-        # Check that it is an Excel-file.
-        try:
-            wb = xlxs.load_workbook(filepath)
-        except xlxs.InvalidFileException:
-            print(f"Error: {filepath} is not an Excel file (.xlxs).")
-            raise
-        # Check that it is a IOC Other Lists file, and if so initialize it.
-        if self._is_other_lists_wb(wb):
+           `IocMasterFile` object. This will only read the worksheet titles and the header row
+           of the file."""
+        # Check that it is an Excel-file, and that it is a IOC Other Lists file, and if so
+        # initialize it. The rest of the rows are read by `read`.
+        titles, header = inspect_workbook(filepath, min_width=2)
+        if self._is_other_lists_title(titles[0]):
             self.iocwbl = iocwbl
             self.order = 2
             self.path = filepath
-            self.workbook = wb
-            self.version = self._other_lists_wb_version(wb)
+            self.version = self._other_lists_version(header)
             self.taxonomy_stats = {}
+            # The rows of the file are stored column by column, with one value per row in each
+            # list. `index` maps the name of a taxon to its row, and `following_rows` maps that row
+            # to the rows without a name that follow it (taxa that are only in the other lists).
+            self.seq_nos = []
+            self.names = []
+            self.ranks = []
+            self.notes = []
+            self.iucn_red_list_categories = []
+            self.list_columns = {key: ([], [], []) for key in OTHER_LISTS_COLUMNS}
+            self.index = {}
+            self.following_rows = {}
             self.lists = {
                 'ioc_7_3': 'Gill, F & D Donsker (Eds). 2017. IOC World Bird List (v 7.3)',
                 'clements_2016': (
@@ -366,27 +725,22 @@ class IocOtherListsFile (object):
             print((f"Error: '{filepath}' is not a valid IOC Other Lists File.\nAn IOC Other "
                    "Lists file must have the word 'vs_other_lists' in the title of the first "
                    "worksheet."))
-            raise InvalidIocOtherListsFile(self.path)
-
-    def _is_other_lists_wb(self, wb):
-        """True if 'wb' is an IOC Other Lists Excel workbook, otherwise False."""
-        return "vs_other_lists" in wb.worksheets[0].title
-
-    def _other_lists_wb_version(self, wb):
-        """Returns the IOC version number of the workbook. Returns None if not able to establish
-           the version."""
-        if self._is_other_lists_wb(wb):
-            s = wb.worksheets[0].cell(row=1, column=2).value
-            regexp = re.compile(r".*\(v (.*)\).*")
-            self.version = regexp.match(s).groups()[0]
-        else:
-            return None
+            raise InvalidIocOtherListsFile(filepath)
+
+    def _is_other_lists_title(self, title):
+        """True if 'title' is the title of the first worksheet of an IOC Other Lists file,
+           otherwise False."""
+        return "vs_other_lists" in title
+
+    def _other_lists_version(self, header):
+        """Returns the IOC version number in the `header` row of the workbook."""
+        s = header[1]
+        start = s.rindex(OTHER_LISTS_VERSION_PREFIX) + len(OTHER_LISTS_VERSION_PREFIX)
+        return s[start:s.rindex(")")]
 
     def read(self):
-        """Read the taxonomy data into the attribute 'self.taxonomy' and
-           save statistics in the attribute 'self.taxonomy_stats'."""
-        # Note that the global variable 'master_taxonomy' is a list that will maintain the
-        # ordering of taxa in the IOC Master file.
+        """Read the taxonomy data into the column attributes (see `__init__`), save statistics in
+           the attribute 'self.taxonomy_stats' and add the other lists to `self.iocwbl`."""
         self.taxonomy_stats = {'infraclass_count': 0,
                                'order_count': 0,
                                'family_count': 0,
@@ -394,124 +748,144 @@ class IocOtherListsFile (object):
                                'species_count': 0,
                                'subspecies_count': 0,
                                'only_in_other_lists_count': 0}
-        ws = self.workbook.worksheets[0]
-        for row in ws.iter_rows(min_row=2):
-            name = row[1].value
-            entry = {'seq_no': row[0].value,
-                     'name': name,
-                     'rank': row[2].value,
-                     'notes': row[3].value,
-                     'iucn_red_list_category': row[32].value,
-                     'following_entries': [],
-                     'lists': {'clements_2016': {'name': row[5].value,
-                                                 'group': row[4].value,
-                                                 'family': row[18].value},
-                               'hbwbl_2016': {'name': row[7].value,
-                                              'group': row[6].value,
-                                              'family': row[19].value},
-                               'hm4_4ed': {'name': row[9].value,
-                                           'group': row[8].value,
-                                           'family': row[20].value},
-                               'hbw_2013': {'name': row[10].value,
-                                            'group': None,
-                                            'family': row[21].value},
-                               'peters_1986': {'name': row[11].value,
-                                               'group': None,
-                                               'family': row[22].value},
-                               'boyd': {'name': row[12].value,
-                                        'group': None,
-                                        'family': row[23].value},
-                               'hbwbl_2017': {'name': row[13].value,
-                                              'group': None,
-                                              'family': row[24].value},
-                               'sibley_1993': {'name': row[14].value,
-                                               'group': None,
-                                               'family': row[25].value},
-                               'ioc_7_2': {'name': row[15].value,
-                                           'group': None,
-                                           'family': row[26].value},
-                               'ioc_7_1': {'name': row[16].value,
-                                           'group': None,
-                                           'family': row[27].value}}}
+        species_count = subspecies_count = only_in_other_lists_count = 0
+        # The row of the most recently read taxon with a name, which the following rows without a
+        # name belong to.
+        latest_i = None
+        # The taxa start at row 2. The last column that is read is the IUCN Red List category.
+        for row in worksheet_rows(self.path, min_row=2, min_width=33):
+            i = len(self.names)
+            name = row[1]
+            self.seq_nos.append(row[0])
+            self.names.append(name)
+            self.ranks.append(row[2])
+            self.notes.append(row[3])
+            self.iucn_red_list_categories.append(row[32])
+            for key, (name_column, group_column, family_column) in OTHER_LISTS_COLUMNS.items():
+                names, groups, families = self.list_columns[key]
+                names.append(row[name_column])
+                groups.append(None if group_column is None else row[group_column])
+                families.append(row[family_column])
             if name:
-                self.taxonomy[name] = entry
-                if len(name.split()) == 2:
-                    self.taxonomy_stats['species_count'] += 1
+                self.index[name] = i
+                self.following_rows[i] = []
+                if name.count(" ") == 1:
+                    species_count += 1
                 else:
-                    self.taxonomy_stats['subspecies_count'] += 1
-                latest_name = name
+                    subspecies_count += 1
+                latest_i = i
             else:
-                self.nonindexed.append(entry)
-                self.taxonomy[latest_name]['following_entries'].append(entry)
-                self.taxonomy_stats['only_in_other_lists_count'] += 1
+                # Rows without a name before the first taxon with a name are counted, but they
+                # don't belong to any taxon.
+                if latest_i is not None:
+                    self.following_rows[latest_i].append(i)
+                only_in_other_lists_count += 1
+        self.taxonomy_stats['species_count'] = species_count
+        self.taxonomy_stats['subspecies_count'] = subspecies_count
+        self.taxonomy_stats['only_in_other_lists_count'] = only_in_other_lists_count
+        self._add_other_lists()
+
+    def _lists(self, i):
+        """Returns the names of the taxon on row `i` in the other lists as a dict."""
+        lists = {}
+        for key, (names, groups, families) in self.list_columns.items():
+            lists[key] = {'name': names[i], 'group': groups[i], 'family': families[i]}
+        return lists
+
+    def _entry(self, i):
+        """Returns the entry on row `i` as a dict."""
+        return {'seq_no': self.seq_nos[i],
+                'name': self.names[i],
+                'rank': self.ranks[i],
+                'notes': self.notes[i],
+                'iucn_red_list_category': self.iucn_red_list_categories[i],
+                'following_entries': [],
+                'lists': self._lists(i)}
+
+    def get(self, name):
+        """Returns the entry for the taxon `name` as a dict, with the entries that are only in the
+           other lists in 'following_entries'. Returns None if there is no such taxon."""
+        i = self.index.get(name)
+        if i is None:
+            return None
+        entry = self._entry(i)
+        entry['following_entries'] = [self._entry(j) for j in self.following_rows[i]]
+        return entry
 
     def _add_other_lists(self):
         """Add other lists based on the IOC Other Lists File to `self.iocwbl`."""
-        # TBD! We probably need to store the data we read from the iocwlb
-        # as a list of "lines"/"entries" each containing information on a taxa,
-        # maybe complementing it with an index of taxon names pointing to the
-        # corresponding "line"/"entry".
-        for name in iter(self.iocwbl.index):
-            if name in self.taxonomy:
-                entries = self.taxonomy[name]["following_entries"]
-                lists = self.taxonomy[name]["lists"]
-                self.iocwbl.index[name]["following_entries"] = (entries)
-                self.iocwbl.index[name]["lists"] = (lists)
+        # Only the taxa that are in both the IOC World Bird List and the file are updated. Their
+        # other lists are built here, the rest of the rows are only kept in the columns.
+        for name in self.iocwbl.index.keys() & self.index.keys():
+            i = self.index[name]
+            taxon = self.iocwbl.index[name]
+            taxon["following_entries"] = [self._entry(j) for j in self.following_rows[i]]
+            taxon["lists"] = self._lists(i)
 
 
 class IocMultilingualFile (object):
     """Represents a IOC Multilingual file (Excel). Languages are encoded with ISO 639-2 codes
        (which are not used in the actual file)."""
 
+    __slots__ = ('order', 'path', 'version', 'iocwbl', 'languages', 'taxonomy',
+                 'taxonomy_stats')
+
     def __init__(self, filepath, iocwbl):
         """Initialize with Excel file `filepath` and an `iocwbl` object obtained from an
-           `IocMasterFile` object. This will not read the contents of the file."""
-        # Check that it is an Excel-file.
-        try:
-            wb = xlxs.load_workbook(filepath)
-        except xlxs.InvalidFileException:
-            print(f"Error: {filepath} is not an Excel file (.xlxs).")
-            raise
-        # Check that it is a IOC Multilingual file, and if so initialize it.
-        if self._is_multilingual_wb(wb):
+           `IocMasterFile` object. This will only read the worksheet titles and the header row
+           of the file."""
+        # Check that it is an Excel-file, and that it is a IOC Multilingual file, and if so
+        # initialize it. The rest of the rows are read by `read`.
+        titles, header = inspect_workbook(filepath, min_width=4)
+        if self._is_multilingual_titles(titles):
             self.iocwbl = iocwbl
             self.order = 3
-            self.workbook = wb
             self.path = filepath
-            self.version = self._multilingual_wb_version(wb)
-            self.taxonomy = {}          # This object contains taxa indexed by their name
+            self.version = self._multilingual_version(header)
+            # This object contains the common names of taxa indexed by their name. The names are
+            # stored as tuples, in the order of the language codes in `self.languages`.
+            self.taxonomy = {}
+            if self.version in ["8.1", "7.3"]:
+                self.languages = MULTILINGUAL_LANGUAGES_8_1
+            else:
+                self.languages = MULTILINGUAL_LANGUAGES_14_1
             self.taxonomy_stats = {}
         else:
             print((f"Error: '{filepath}' is not a valid IOC Multilingual File.\nAn IOC Multilingual"
                    "file must have the word 'List' in the title of the first worksheet and"
                    "'Sources' in the title of the second worksheet."))
-            raise InvalidIocMultilingualFile(self.path)
-
-    def _is_multilingual_wb(self, wb):
-        """True if 'wb' is an IOC Multilingual Excel workbook, otherwise False."""
-        return wb.worksheets[0].title == "List" and wb.worksheets[1].title == "Sources"
-
-    def _multilingual_wb_version(self, wb):
-        """Returns the IOC version number of the workbook. Returns None if not able to establish
-           the version."""
-        if self._is_multilingual_wb(wb):
-            if wb.worksheets[0].cell(row=1, column=4).value[0:4] == "IOC_":
-                # This shouild work for "IOC_14.1" and later
-                return wb.worksheets[0].cell(row=1, column=4).value[4:]
-            elif wb.worksheets[0].cell(row=1, column=4).value == "Scientific Name 8.1":
-                return "8.1"
-            elif wb.worksheets[0].cell(row=1, column=1).value == "7.3":
-                return "7.3"
-            else:
-                return None
+            raise InvalidIocMultilingualFile(filepath)
+
+    def _is_multilingual_titles(self, titles):
+        """True if 'titles' are the worksheet titles of an IOC Multilingual Excel workbook,
+           otherwise False."""
+        return titles[:2] == ["List", "Sources"]
+
+    def _multilingual_version(self, header):
+        """Returns the IOC version number in the `header` row of the workbook. Returns None if not
+           able to establish the version."""
+        if str(header[3]).startswith("IOC_"):
+            # This shouild work for "IOC_14.1" and later
+            return header[3][4:]
+        elif header[3] == "Scientific Name 8.1":
+            return "8.1"
+        elif str(header[0]) == "7.3":
+            # The version in the 7.3 file is a number.
+            return "7.3"
         else:
             return None
 
     def _add_languages(self):
         """Add languages from the IOC Multilingual file to `self.iocwbl`."""
-        for name in iter(self.iocwbl.index):
-            if name in self.taxonomy:
-                self.iocwbl.index[name]["common_names"].update(self.taxonomy[name])
+        # Only the taxa that are in both the IOC World Bird List and the file are updated.
+        for name in self.iocwbl.index.keys() & self.taxonomy.keys():
+            common_names = zip(self.languages, self.taxonomy[name])
+            self.iocwbl.index[name]["common_names"].update(common_names)
+
+    def _is_species_row(self, row):
+        """True if `row` of an IOC Multilingual file of version 8.1 or 7.3 starts a species, i.e.
+           has a binomial name, otherwise False."""
+        return bool(row[3]) and row[3].count(" ") == 1
 
     def read(self):
         """Read the taxonomy data into the attribute 'self.taxonomy' and
@@ -524,118 +898,54 @@ class IocMultilingualFile (object):
                                'genus_count': 0,
                                'species_count': 0,
                                'subspecies_count': 0}
-        ws = self.workbook.worksheets[0]
+        species_count = 0
         if self.version in ["8.1", "7.3"]:
-            i = 0
-            for row in ws.iter_rows(min_row=4):
-                if row[3].value and len(row[3].value.split()) == 2:
-                    name = row[3].value
-                    self.taxonomy_stats['species_count'] += 1
-                    i = 1
-                    entry = {'cat': row[6].value,
-                             'cze': row[9].value,
-                             'est': row[12].value,
-                             'ger': row[15].value,
-                             'ind': row[18].value,
-                             'lav': row[21].value,
-                             'pol': row[24].value,
-                             'slo': row[27].value,
-                             'swe': row[30].value}
-                elif i == 1:
-                    i = 2
-                    entry['eng'] = row[4].value
-                    entry['chi'] = row[7].value
-                    entry['dan'] = row[10].value
-                    entry['fin'] = row[13].value
-                    entry['hun'] = row[16].value
-                    entry['ita'] = row[19].value
-                    entry['lit'] = row[22].value
-                    entry['por'] = row[25].value
-                    entry['slv'] = row[28].value
-                elif i == 2:
-                    i = 0
-                    entry['lzh'] = row[8].value
-                    entry['dut'] = row[11].value
-                    entry['fre'] = row[14].value
-                    entry['ice'] = row[17].value
-                    entry['jpn'] = row[20].value
-                    entry['nno'] = row[23].value
-                    entry['rus'] = row[26].value
-                    entry['spa'] = row[29].value
-                    self.taxonomy[name] = entry
+            # The taxa start at row 4. Each species takes up three rows, with the names in a
+            # different set of languages on each row, so read the two following rows together
+            # with the species row. A species with less than three rows, i.e. followed by the
+            # next species or the end of the file, is counted but left out.
+            rows = worksheet_rows(self.path, min_row=4, min_width=31)
+            row = next(rows, None)
+            while row is not None:
+                if self._is_species_row(row):
+                    species_count += 1
+                    group = [row]
+                    row = next(rows, None)
+                    while len(group) < 3 and row is not None and not self._is_species_row(row):
+                        group.append(row)
+                        row = next(rows, None)
+                    if len(group) == 3:
+                        self.taxonomy[group[0][3]] = (group[0][6:31:3] + group[1][4:29:3] +
+                                                      group[2][8:30:3])
+                else:
+                    row = next(rows, None)
         else:  # self.version == "14.1"
-            # We use IETF BCP 47 language codes. There is a Python module 'langcodes' that can be
-            # used to work with them. E.g: `langcodes.get("zh-Hant").display_name()` will return
-            # 'Chinese (Traditional)'.
-            for row in ws.iter_rows(min_row=2):
-                name = row[3].value
-                entry = {'en': row[4].value,
-                         'ca': row[5].value,
-                         'zh-Hans': row[6].value,
-                         'zh-Hant': row[7].value,
-                         'hr': row[8].value,
-                         'cs': row[9].value,
-                         'da': row[10].value,
-                         'nl': row[11].value,
-                         'fi': row[12].value,
-                         'fr': row[13].value,
-                         'de': row[14].value,
-                         'it': row[15].value,
-                         'ja': row[16].value,
-                         'lt': row[17].value,
-                         'no': row[18].value,
-                         'pl': row[19].value,
-                         'pt-br': row[20].value,
-                         'pt': row[21].value,
-                         'ru': row[22].value,
-                         'sr': row[23].value,
-                         'sk': row[24].value,
-                         'es': row[25].value,
-                         'sv': row[26].value,
-                         'tr': row[27].value,
-                         'uk': row[28].value,
-                         'af': row[29].value,
-                         'ar': row[30].value,
-                         'be': row[31].value,
-                         'bg': row[32].value,
-                         'et': row[33].value,
-                         'el': row[34].value,
-                         'he': row[35].value,
-                         'hu': row[36].value,
-                         'is': row[37].value,
-                         'id': row[38].value,
-                         'ko': row[39].value,
-                         'lv': row[40].value,
-                         'mk': row[41].value,
-                         'ml': row[42].value,
-                         'se': row[43].value,
-                         'fa': row[44].value,
-                         'ro': row[45].value,
-                         'sl': row[46].value,
-                         'th': row[47].value}
-                self.taxonomy[name] = entry
-                self.taxonomy_stats['species_count'] += 1
+            # The taxa start at row 2.
+            for row in worksheet_rows(self.path, min_row=2, min_width=48):
+                self.taxonomy[row[3]] = row[4:48]
+                species_count += 1
+        self.taxonomy_stats['species_count'] = species_count
         self._add_languages()
 
 
 class IocComplementaryFile (object):
     """Represents a IOC Complementary file (Excel)."""
 
+    __slots__ = ('order', 'path', 'version', 'iocwbl', 'column_shift', 'taxonomy',
+                 'taxonomy_stats', '_species')
+
     def __init__(self, filepath, iocwbl):
-        """Initialize with Excel file `filepath`. This will not read the contents of the file."""
-        # Check that it is an Excel-file.
-        try:
-            wb = xlxs.load_workbook(filepath)
-        except xlxs.InvalidFileException:
-            print(f"Error: {filepath} is not an Excel file (.xlxs).")
-            raise
-        # Check that it is a IOC Multilingual file, and if so initialize it.
-        if self._is_complementary_wb(wb):
+        """Initialize with Excel file `filepath`. This will only read the worksheet titles and the
+           header row of the file."""
+        # Check that it is an Excel-file, and that it is a IOC Complementary file, and if so
+        # initialize it. The rest of the rows are read by `read`.
+        titles, header = inspect_workbook(filepath, min_width=7)
+        version = self._complementary_version(titles[0])
+        if self._is_complementary_header(version, header):
             self.iocwbl = iocwbl
             self.order = 4
-            self.workbook = wb
             self.path = filepath
-            self.version = self._complementary_wb_version(self.workbook)
+            self.version = version
             self.taxonomy = {}          # This object contains taxa indexed by their name
             self.taxonomy_stats = {}
         # Check the version, to see if we need to do column shift when reading data from it.
@@ -647,49 +957,103 @@ class IocComplementaryFile (object):
             print((f"Error: '{filepath}' is not a valid IOC Complementary File.\nThe first "
                    "worksheet title of an IOC Complementary file must be 'IOC 7.3', 'IOC 8.1' "
                    "or '14.1'."))
-            raise InvalidIocComplementaryFile(self.path)
-
-    def _is_complementary_wb(self, wb):
-        """True if 'wb' is an IOC Complementary Excel workbook, otherwise False. These files are
-           normally named 'IOC_Names_File_Plus-N.M.xlxs, where N is the major version number and
-           M is the minor version number."""
-        sheet = wb.worksheets[0]
-        version = self._complementary_wb_version(wb)
-        if version:
-            if version in ["7.3", "8.1"]:
-                if ((sheet.cell(row=1, column=4).value == "English name") and
-                   (sheet.cell(row=1, column=5).value == "Counters")):
-                    return True
-                else:
-                    return False
-            elif version in ["14.1", "14.2"]:
-                if ((sheet.cell(row=1, column=6).value == "English name") and
-                   (sheet.cell(row=1, column=7).value == "Counters")):
-                    return True
-                else:
-                    return False
+            raise InvalidIocComplementaryFile(filepath)
+
+    def _is_complementary_header(self, version, header):
+        """True if `header` is the header row of an IOC Complementary Excel workbook of the IOC
+           version `version`, otherwise False. These files are normally named
+           'IOC_Names_File_Plus-N.M.xlxs, where N is the major version number and M is the minor
+           version number."""
+        if version in ["7.3", "8.1"]:
+            return header[3:5] == ("English name", "Counters")
+        elif version in ["14.1", "14.2"]:
+            return header[5:7] == ("English name", "Counters")
         else:
             return False
 
-    def _complementary_wb_version(self, wb):
-        """Returns the IOC version number of the workbook. Returns None if not able to establish
-           the version."""
-        if wb.worksheets[0].title == "IOC 7.3":
+    def _complementary_version(self, title):
+        """Returns the IOC version number of the workbook with the first worksheet `title`."""
+        if title == "IOC 7.3":
             return "7.3"
-        elif wb.worksheets[0].title == "IOC 8.1":
+        elif title == "IOC 8.1":
             return "8.1"
         else:
             # This works for 14.1 and 14.2
-            return wb.worksheets[0].title
+            return title
 
     def _add_complementary_info(self):
         """Add complementary information from the IOC Complementary file to `self.iocwbl`."""
-        for name in iter(self.iocwbl.index):
-            relevant_ranks = ["Genus", "Species", "Subspecies"]
-            if name in self.taxonomy and self.iocwbl.index[name]["rank"] in relevant_ranks:
+        relevant_ranks = ("Genus", "Species", "Subspecies")
+        # Only the taxa that are in both the IOC World Bird List and the file are updated.
+        for name in self.iocwbl.index.keys() & self.taxonomy.keys():
+            if self.iocwbl.index[name]["rank"] in relevant_ranks:
                 self.iocwbl.index[name]["extinct"] = self.taxonomy[name]["extinct"]
                 self.iocwbl.index[name]["code"] = self.taxonomy[name]["code"]
 
+    def _read_infraclass(self, row):
+        """Read the infraclass on `row` into the attribute 'self.taxonomy'."""
+        name = row[5]
+        self.taxonomy[name] = {'name': name,
+                               'rank': 'Infraclass',
+                               'code': row[9],
+                               'comment': row[10]}
+
+    def _read_order(self, row):
+        """Read the order on `row` into the attribute 'self.taxonomy'."""
+        name = row[5].split()[1]
+        self.taxonomy[name] = {'name': name,
+                               'rank': 'Order',
+                               'code': row[9],
+                               'comment': row[10]}
+
+    def _read_family(self, row):
+        """Read the family on `row` into the attribute 'self.taxonomy'."""
+        name = row[5].split()[1]
+        self.taxonomy[name] = {'species_count': row[2],
+                               'name_eng': row[3],
+                               'name': name,
+                               'rank': 'Family',
+                               'code': row[9],
+                               'comment': row[10]}
+
+    def _read_genus(self, row):
+        """Read the genus on `row` into the attribute 'self.taxonomy'."""
+        name = row[5]
+        self.taxonomy[name] = {'extinct': row[2],
+                               'name': name,
+                               'rank': 'Genus',
+                               'authority': row[6],
+                               'code': row[9],
+                               'comment': row[10]}
+
+    def _read_species(self, row):
+        """Read the species on `row` into the attribute 'self.taxonomy'."""
+        name = row[5]
+        self.taxonomy[name] = {'extinct': row[2],
+                               'name': name,
+                               'rank': 'Species',
+                               'name_eng': row[3],
+                               'authority': row[6],
+                               'breeding_range': row[7],
+                               'nonbreeding_range': row[8],
+                               'code': row[9],
+                               'comment': row[10]}
+        self._species = row[6]
+
+    def _read_subspecies(self, row):
+        """Read the subspecies on `row` into the attribute 'self.taxonomy'. The name is made from
+           the species last read by `_read_species`."""
+        name = self._species + ' ' + row[5].split()[2]
+        self.taxonomy[name] = {'extinct': row[2],
+                               'name': name,
+                               'rank': 'Subspecies',
+                               'name_eng': row[3],
+                               'authority': row[6],
+                               'breeding_range': row[7],
+                               'nonbreeding_range': row[8],
+                               'code': row[9],
+                               'comment': row[10]}
+
     def read(self):
         """Read the taxonomy data into the attribute 'self.taxonomy' and
            save statistics in the attribute 'self.taxonomy_stats'."""
@@ -701,57 +1065,18 @@ class IocComplementaryFile (object):
                                'genus_count': 0,
                                'species_count': 0,
                                'subspecies_count': 0}
-        ws = self.workbook.worksheets[0]
-        for row in ws.iter_rows(min_row=3):
-            if row[1].value == "Blank":
-                name = row[5].value
-                self.taxonomy[name] = {'name': name,
-                                       'rank': 'Infraclass',
-                                       'code': row[9].value,
-                                       'comment': row[10].value}
-            elif row[1].value == "ORDER":
-                name = row[5].value.split()[1],
-                self.taxonomy[name] = {'name': name,
-                                       'rank': 'Order',
-                                       'code': row[9].value,
-                                       'comment': row[10].value}
-            elif row[1].value == "Family":
-                name = row[5].value.split()[1]
-                self.taxonomy[name] = {'species_count': row[2].value,
-                                       'name_eng': row[3].value,
-                                       'name': name,
-                                       'rank': 'Family',
-                                       'code': row[9].value,
-                                       'comment': row[10].value}
-            elif row[1].value == "Genus":
-                name = row[5].value
-                self.taxonomy[name] = {'extinct': row[2].value,
-                                       'name': name,
-                                       'rank': 'Genus',
-                                       'authority': row[6].value,
-                                       'code': row[9].value,
-                                       'comment': row[10].value}
-            elif row[1].value == "Species":
-                name = row[5].value
-                self.taxonomy[name] = {'extinct': row[2].value,
-                                       'name': name,
-                                       'rank': 'Species',
-                                       'name_eng': row[3].value,
-                                       'authority': row[6].value,
-                                       'breeding_range': row[7].value,
-                                       'nonbreeding_range': row[8].value,
-                                       'code': row[9].value,
-                                       'comment': row[10].value}
-                species = row[6].value
-            elif row[2].value == "ssp":
-                name = species + ' ' + row[5].value.split()[2]
-                self.taxonomy[name] = {'extinct': row[2].value,
-                                       'name': name,
-                                       'rank': 'Subspecies',
-                                       'name_eng': row[3].value,
-                                       'authority': row[6].value,
-                                       'breeding_range': row[7].value,
-                                       'nonbreeding_range': row[8].value,
-                                       'code': row[9].value,
-                                       'comment': row[10].value}
+        # Readers for the rows of each rank, indexed by the value in the rank column.
+        readers = {"Blank": self._read_infraclass,
+                   "ORDER": self._read_order,
+                   "Family": self._read_family,
+                   "Genus": self._read_genus,
+                   "Species": self._read_species}
+        self._species = None
+        # The taxa start at row 3. The last column that is read is the comment.
+        for row in worksheet_rows(self.path, min_row=3, min_width=11):
+            reader = readers.get(row[1])
+            if reader:
+                reader(row)
+            elif row[2] == "ssp":
+                self._read_subspecies(row)
         self._add_complementary_info()
@@ -4,6 +4,7 @@
    of that data to stdout, or to files."""
 
 import argparse
+import itertools
 import os
 import os.path
 import sys
@@ -23,12 +24,28 @@ DEFAULT_DATA_DIR = "./gendata"
 DEFAULT_IOC_TAXONOMY_DIR = "ioc"
 VERSION_FILE_NAME = "version.json"
 
+# The optional IOC files, in the order they are read after the IOC Master file. Each one is given
+# by the key of its path in the dict of files, its class and its description in messages.
+OPTIONAL_IOC_FILES = [("other-lists-file", iocfiles.IocOtherListsFile, "Other Lists"),
+                      ("multilingual-file", iocfiles.IocMultilingualFile, "Multilingual"),
+                      ("complimentary-file", iocfiles.IocComplementaryFile, "Complementary")]
+
+# Number of JSON chunks from the encoder that are joined and written to stdout at a time.
+JSON_CHUNKS_PER_WRITE = 4096
+
 
 def print_to_stdout(iocwbl, verbose):
     """Print JSON representations to stdout."""
     if verbose:
         print("Printing to stdout ...")
-    print(json.dumps(iocwbl.taxonomy, indent=2))
+    # Write the JSON in parts, instead of building the indented JSON of the whole taxonomy as one
+    # string, which takes more memory than the taxonomy itself.
+    chunks = json.JSONEncoder(indent=2).iterencode(iocwbl.taxonomy)
+    part = "".join(itertools.islice(chunks, JSON_CHUNKS_PER_WRITE))
+    while part:
+        sys.stdout.write(part)
+        part = "".join(itertools.islice(chunks, JSON_CHUNKS_PER_WRITE))
+    print()
 
 
 def print_taxonomy_info(iocwbl, verbose):
@@ -53,15 +70,17 @@ def print_taxonomy_info(iocwbl, verbose):
 def file_versions_are_consistent(ioc_files):
     """Returns true if all `version` values in the list of Ioc*File objects in `ioc_files` have
        the same value."""
-    version_values = [file.version for file in ioc_files]
-    return len(set(version_values)) <= 1
+    return len({file.version for file in ioc_files}) <= 1
 
 
-def handle_files(filepaths, write, output_dir, info, verbose, dry_run):
+def handle_files(filepaths, write, output_dir, info, verbose, dry_run, cache_dir=None,
+                 bundle=False):
     """Handle the IOC files. if 'write' then write data to files. If 'info'
        then print information on the contents of the files. If 'verbose'
        then print information on progress and what's happening. If 'dry_run'
-       don't write taxonomy info to files or to stdout."""
+       don't write taxonomy info to files or to stdout. If 'cache_dir' then
+       cache the taxonomy read from the IOC Master file in that directory. If
+       'bundle' then write all taxa to one file instead of one file per taxon."""
     if verbose:
         if dry_run:
             print("Dry-run: No taxonomy information will be written to files or to stdout")
@@ -73,30 +92,17 @@ def handle_files(filepaths, write, output_dir, info, verbose, dry_run):
     if verbose:
         print(f"Reading IOC Master File '{ioc_master_file.path}'")
         print(f"IOC Master File Version: {ioc_master_file.version}")
-    ioc_master_file.read()
+    ioc_master_file.read(cache_dir)
     iocwbl = ioc_master_file.iocwbl
     # Then check if any other of the IOC files are to be read, and do so if specified.
-    if filepaths["other-lists-file"]:
-        other_lists_file = iocfiles.IocOtherListsFile(filepaths["other-lists-file"], iocwbl)
-        if verbose:
-            print(f"Reading IOC Other Lists File '{other_lists_file.path}'")
-            print(f"IOC Other Lists File Version: {other_lists_file.version}")
-        other_lists_file.read()
-        ioc_files.append(other_lists_file)
-    if filepaths["multilingual-file"]:
-        multilingual_file = iocfiles.IocMultilingualFile(filepaths["multilingual-file"], iocwbl)
-        if verbose:
-            print(f"Reading IOC Multilingual File '{multilingual_file.path}'")
-            print(f"IOC Multilingual File Version: {multilingual_file.version}")
-        multilingual_file.read()
-        ioc_files.append(multilingual_file)
-    if filepaths["complimentary-file"]:
-        complimentary_file = iocfiles.IocComplementaryFile(filepaths["complimentary-file"], iocwbl)
-        if verbose:
-            print(f"Reading IOC Complementary File '{complimentary_file.path}'")
-            print(f"IOC Complementary File Version: {complimentary_file.version}")
-        complimentary_file.read()
-        ioc_files.append(complimentary_file)
+    for key, ioc_file_class, description in OPTIONAL_IOC_FILES:
+        if filepaths[key]:
+            ioc_file = ioc_file_class(filepaths[key], iocwbl)
+            if verbose:
+                print(f"Reading IOC {description} File '{ioc_file.path}'")
+                print(f"IOC {description} File Version: {ioc_file.version}")
+            ioc_file.read()
+            ioc_files.append(ioc_file)
     # Check that the IOC files have consistent versions
     if not file_versions_are_consistent(ioc_files):
         print("Error: Version mismatch between IOC files.")
@@ -105,14 +111,15 @@ def handle_files(filepaths, write, output_dir, info, verbose, dry_run):
     if not dry_run:
         if write:
             p = os.path.join(output_dir, DEFAULT_IOC_TAXONOMY_DIR)
-            if os.path.exists(p):
+            # Let makedirs() fail if the directory exists, instead of checking for it first.
+            try:
+                os.makedirs(p)
+            except FileExistsError:
                 print("Error: Directory '%s' already exists." % (p))
                 sys.exit(ERROR_DATA_DIR_EXISTS_ALREADY)
-            else:
-                if verbose:
-                    print("Writing files ...")
-                os.makedirs(p)
-                iocwbl.write_to_files(p, VERSION_FILE_NAME)
+            if verbose:
+                print("Writing files ...")
+            iocwbl.write_to_files(p, VERSION_FILE_NAME, bundle)
         else:
             print_to_stdout(iocwbl, verbose)
     if info:
@@ -134,9 +141,17 @@ def main():
                         help="print info about the IOC files [False]")
     parser.add_argument('-w', '--write', action='store_true', default=False,
                         help="write to JSON files [False]")
+    parser.add_argument('-b', '--bundle', action='store_true', default=False,
+                        help=("write all taxa to one JSON Lines file "
+                              f"'{iocfiles.BUNDLE_FILE_NAME}' instead of one JSON file per taxon, "
+                              "when writing to JSON files [False]"))
     parser.add_argument('-o', '--output-dir', default=DEFAULT_DATA_DIR,
                         help=("directory where the output directory with JSON files "
                               f"is written [{DEFAULT_DATA_DIR}]"))
+    parser.add_argument('-c', '--cache', action='store_true', default=False,
+                        help=("cache the taxonomy read from the IOC Master file in "
+                              f"{iocfiles.DEFAULT_CACHE_DIR} and reuse it when the same file is "
+                              "read again [False]"))
     parser.add_argument('-O', '--other-lists-file', default=None,
                         help="IOC Other Lists file")
     parser.add_argument('-M', '--multilingual-file', default=None,
@@ -171,7 +186,9 @@ def main():
     else:
         files["complimentary-file"] = args.complimentary_file
     # Then read the files in correct order
-    handle_files(files, args.write, args.output_dir, args.info, args.verbose, args.dry_run)
+    cache_dir = iocfiles.DEFAULT_CACHE_DIR if args.cache else None
+    handle_files(files, args.write, args.output_dir, args.info, args.verbose, args.dry_run,
+                 cache_dir, args.bundle)
 
 
 if __name__ == "__main__":
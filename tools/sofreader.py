@@ -61,14 +61,15 @@ def handle_files(filepath, write, output_dir, info, verbose, dry_run):
     if not dry_run:
         if write:
             p = os.path.join(output_dir, DEFAULT_SOF_TAXONOMY_DIR)
-            if os.path.exists(p):
+            # Let makedirs() fail if the directory exists, instead of checking for it first.
+            try:
+                os.makedirs(p)
+            except FileExistsError:
                 print("Error: Directory '%s' already exists." % (p))
                 sys.exit(ERROR_DATA_DIR_EXISTS_ALREADY)
-            else:
-                if verbose:
-                    print("Writing files ...")
-                os.makedirs(p)
-                sofwbl.write_to_files(p, VERSION_FILE_NAME)
+            if verbose:
+                print("Writing files ...")
+            sofwbl.write_to_files(p, VERSION_FILE_NAME)
         else:
             print_to_stdout(sofwbl, verbose)
     if info:
@@ -1,11 +1,21 @@
 # This file contains Pytest-based unit tests for the IOC and SOF files modules.
 
-# import glob
+import glob
+import itertools
 import os
+import pickle
 import pytest
+import re
 import shlex
 import shutil
 import subprocess
+import zipfile
+
+import openpyxl
+from openpyxl.utils.datetime import from_excel
+
+import iocfiles
+import iocreader
 
 # Constants
 TOOLS_DIR = "./tools/"
@@ -144,3 +154,191 @@ def test_ioc_reader():
                                        text=True,
                                        shell=False)
     assert completed_process.returncode == 0
+
+
+@pytest.mark.parametrize("option", ["", "-b"])
+def test_ioc_writer_and_loader(tmp_path, capsys, option):
+    """Test writing the IOC taxonomy to JSON files, one file per taxon or bundled in one JSON
+       Lines file (-b), and loading it again with `iocfiles.IocWbl`. The loaded taxonomy must
+       have the same statistics as the one read from the IOC files."""
+    command = f"./{IOC_READER} -id {IOC_DATA_FILES['master_file']}"
+    completed_process = subprocess.run(shlex.split(command), capture_output=True, text=True)
+    assert completed_process.returncode == 0
+    expected_info = completed_process.stdout
+    command = f"./{IOC_READER} -w {option} -o {tmp_path} {IOC_DATA_FILES['master_file']}"
+    completed_process = subprocess.run(shlex.split(command), capture_output=True, text=True)
+    assert completed_process.returncode == 0
+    ioc_dir = tmp_path / iocfiles.DEFAULT_IOC_TAXONOMY_DIR
+    if option == "-b":
+        assert sorted(os.listdir(ioc_dir)) == [iocfiles.BUNDLE_FILE_NAME,
+                                               iocfiles.VERSION_FILE_NAME]
+    else:
+        assert (ioc_dir / iocfiles.INDEX_FILE_NAME).is_file()
+    iocwbl = iocfiles.IocWbl(str(ioc_dir))
+    iocreader.print_taxonomy_info(iocwbl, False)
+    assert capsys.readouterr().out == expected_info
+
+
+def test_ioc_reader_cache(tmp_path):
+    """Test the cache option of the IOC reader. A second run must print the same taxonomy from
+       the cache, and a damaged cache file must be read as a cache miss and be replaced."""
+    env = dict(os.environ, HOME=str(tmp_path))
+    cache_dir = tmp_path / ".cache" / "coral"
+    command = f"./{IOC_READER} -c {IOC_DATA_FILES['master_file']}"
+    completed_process1 = subprocess.run(shlex.split(command), capture_output=True, text=True,
+                                        env=env)
+    assert completed_process1.returncode == 0
+    cache_files = list(cache_dir.glob("*.pkl"))
+    assert len(cache_files) == 1
+    completed_process2 = subprocess.run(shlex.split(command), capture_output=True, text=True,
+                                        env=env)
+    assert completed_process2.returncode == 0
+    assert completed_process2.stdout == completed_process1.stdout
+    # Damage the cache file, and add a cache file of an older version of the same Master file,
+    # which must be removed when the cache file is written again.
+    cache_file = cache_files[0]
+    cache_file.write_bytes(cache_file.read_bytes()[:1000])
+    old_cache_file = cache_dir / (cache_file.name.split("-")[0] + "-old.pkl")
+    old_cache_file.write_bytes(b"")
+    completed_process3 = subprocess.run(shlex.split(command), capture_output=True, text=True,
+                                        env=env)
+    assert completed_process3.returncode == 0
+    assert completed_process3.stdout == completed_process1.stdout
+    assert list(cache_dir.glob("*")) == [cache_file]
+
+
+@pytest.mark.parametrize("data", [b"",
+                                  b"cnosuchmodule\nname\n.",
+                                  b"cbuiltins\nnosuchname\n.",
+                                  b"I12x\n.",
+                                  pickle.dumps(("taxonomy", "index")),
+                                  pickle.dumps(("taxonomy", "index", "stats")),
+                                  pickle.dumps(([], {}, {'species_count': 0}))])
+def test_ioc_master_file_damaged_cache(tmp_path, data):
+    """Test that a cache file that can't be unpickled, whatever the exception, or that holds
+       something else than a cached taxonomy is read as a cache miss."""
+    ioc_master_file = iocfiles.IocMasterFile(IOC_DATA_FILES["master_file"])
+    cache_path = tmp_path / "cache.pkl"
+    cache_path.write_bytes(data)
+    assert ioc_master_file._load_cache(cache_path) is None
+    cached = ([], {}, dict(ioc_master_file.iocwbl.stats))
+    cache_path.write_bytes(pickle.dumps(cached))
+    assert ioc_master_file._load_cache(cache_path) == cached
+
+
+def test_ioc_other_lists_file_rows_without_name(tmp_path):
+    """Test that rows without a name in an IOC Other Lists file are added to the taxon before
+       them, and that they are counted but left out if there is no taxon before them."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "IOC_8.1_vs_other_lists"
+    ws.append(["Seq", "IOC_8.1 (v 8.1)"])
+    for name, clements_name in [(None, "Genus zero"), ("Genus one", "Genus one"),
+                                (None, "Genus other"), ("Genus one two", "Genus one two")]:
+        ws.append([None, name, None, None, None, clements_name] + [None] * 27)
+    filepath = tmp_path / "other_lists.xlsx"
+    wb.save(filepath)
+    iocwbl = iocfiles.IocWbl()
+    iocwbl.index["Genus one"] = {}
+    ioc_other_lists_file = iocfiles.IocOtherListsFile(str(filepath), iocwbl)
+    assert ioc_other_lists_file.version == "8.1"
+    ioc_other_lists_file.read()
+    assert ioc_other_lists_file.taxonomy_stats['species_count'] == 1
+    assert ioc_other_lists_file.taxonomy_stats['subspecies_count'] == 1
+    assert ioc_other_lists_file.taxonomy_stats['only_in_other_lists_count'] == 2
+    taxon = iocwbl.index["Genus one"]
+    assert taxon["lists"]["clements_2016"]["name"] == "Genus one"
+    assert [entry["lists"]["clements_2016"]["name"] for entry in taxon["following_entries"]] == \
+        ["Genus other"]
+    assert ioc_other_lists_file.get("Genus one")["following_entries"] == taxon["following_entries"]
+
+
+def test_ioc_multilingual_file_groups(tmp_path):
+    """Test that a species in an IOC Multilingual file of version 8.1, with the names of each
+       species on three rows, is left out if it has less than three rows, without taking the rows
+       of the next species."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "List"
+    wb.create_sheet("Sources")
+    ws.append([1, "Order", "Family", "Scientific Name 8.1"])
+    ws.append([])
+    ws.append([])
+    for name, row_count in [("Genus one", 3), ("Genus two", 2), ("Genus three", 3),
+                            ("Genus four", 1)]:
+        ws.append([None, None, None, name] + [None, None, f"{name} 1"] + [None] * 24)
+        for i in range(2, row_count + 1):
+            ws.append([None] * 4 + [f"{name} {i}"] * 27)
+    filepath = tmp_path / "multilingual.xlsx"
+    wb.save(filepath)
+    ioc_multilingual_file = iocfiles.IocMultilingualFile(str(filepath), iocfiles.IocWbl())
+    assert ioc_multilingual_file.version == "8.1"
+    ioc_multilingual_file.read()
+    assert list(ioc_multilingual_file.taxonomy) == ["Genus one", "Genus three"]
+    names = ("Genus three 1",) + (None,) * 8 + ("Genus three 2",) * 9 + ("Genus three 3",) * 8
+    assert ioc_multilingual_file.taxonomy["Genus three"] == names
+    assert ioc_multilingual_file.taxonomy_stats['species_count'] == 4
+
+
+def remove_dimension(filepath, dimensionless_path):
+    """Copy the Excel file `filepath` to `dimensionless_path` without the dimension (the range of
+       the cells) of the worksheets, which is optional."""
+    with zipfile.ZipFile(filepath) as archive, \
+         zipfile.ZipFile(dimensionless_path, "w", zipfile.ZIP_DEFLATED) as dimensionless:
+        for item in archive.infolist():
+            data = archive.read(item)
+            if item.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb"<dimension [^>]*/>", b"", data)
+            dimensionless.writestr(item, data)
+
+
+def test_worksheet_rows(tmp_path):
+    """Test that `iocfiles.worksheet_rows` reads the same rows as openpyxl from the IOC files. Dates
+       are not converted by `worksheet_rows`, so they are compared as Excel serial numbers. Without
+       a dimension in the worksheet, the rows are padded to the given minimum width."""
+    for filepath in sorted(glob.glob(IOC_DATA_DIR + "*.xlsx")):
+        wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+        expected_rows = wb.worksheets[0].iter_rows(values_only=True)
+        rows = iocfiles.worksheet_rows(filepath)
+        for expected_row, row in itertools.zip_longest(expected_rows, rows):
+            if row == expected_row:
+                continue
+            assert row is not None and expected_row is not None, filepath
+            assert len(row) == len(expected_row), filepath
+            for expected_value, value in zip(expected_row, row):
+                if hasattr(expected_value, "isoformat"):
+                    value = from_excel(value)
+                assert value == expected_value, filepath
+        wb.close()
+    wb = openpyxl.Workbook()
+    wb.active.append(["Master", None, "IOC names file (v 14.1)"])
+    wb.active.append([])
+    wb.active.append(["Infraclass", 1, 2.5, True, None, "Order"])
+    wb.active.append([None, "short"])
+    filepath = tmp_path / "sheet.xlsx"
+    dimensionless_path = tmp_path / "dimensionless.xlsx"
+    wb.save(filepath)
+    remove_dimension(filepath, dimensionless_path)
+    with zipfile.ZipFile(dimensionless_path) as archive:
+        assert b"<dimension" not in archive.read("xl/worksheets/sheet1.xml")
+    expected_rows = list(wb.active.iter_rows(values_only=True))
+    assert list(iocfiles.worksheet_rows(dimensionless_path, min_width=6)) == expected_rows
+    assert [len(row) for row in iocfiles.worksheet_rows(dimensionless_path, min_width=8)] == [8] * 4
+    titles, header = iocfiles.inspect_workbook(dimensionless_path, min_width=6)
+    assert titles == ["Sheet"]
+    assert header == expected_rows[0]
+
+
+def test_ioc_master_file_without_dimension(tmp_path):
+    """Test that an IOC Master file without a dimension in the worksheet is read like the same file
+       with a dimension."""
+    master_file = IOC_DATA_DIR + "master_ioc_list_v14.1.xlsx"
+    dimensionless_file = str(tmp_path / "master_ioc_list_v14.1.xlsx")
+    remove_dimension(master_file, dimensionless_file)
+    expected_ioc_master_file = iocfiles.IocMasterFile(master_file)
+    expected_ioc_master_file.read()
+    ioc_master_file = iocfiles.IocMasterFile(dimensionless_file)
+    ioc_master_file.read()
+    assert ioc_master_file.version == expected_ioc_master_file.version
+    assert ioc_master_file.iocwbl.stats == expected_ioc_master_file.iocwbl.stats
+    assert ioc_master_file.iocwbl.taxonomy == expected_ioc_master_file.iocwbl.taxonomy